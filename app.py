@@ -4,25 +4,43 @@ Provides API endpoints for stock analysis, alerts, and dashboard data.
 """
 
 import os
+import base64
+import hashlib
 import json
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
 from functools import wraps
-from flask import Flask, jsonify, request, send_from_directory, render_template_string
+from flask import Flask, Response, jsonify, make_response, request, send_from_directory, render_template_string, stream_with_context
 from flask_mail import Mail, Message
 
 
 def utcnow():
     """Get current UTC time (timezone-aware)."""
     return datetime.now(timezone.utc)
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import case, event, func, inspect, select, text, tuple_, update
+from sqlalchemy.types import DateTime, TypeDecorator
+from sqlalchemy.dialects import postgresql, sqlite
 from flask_mail import Mail, Message
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
 from dotenv import load_dotenv
+from cachetools import TTLCache, cached
+import orjson
 import logging
 
 from stock_analyzer import CandlestickAnalyzer, get_nse_stock_list
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock; assume a single process (e.g. python app.py)
+    fcntl = None
+
 # Load environment variables
 load_dotenv()
 
@@ -33,14 +51,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# orjson serializes datetimes and NumPy scalars natively; naive DB datetimes are
+# UTC instants (calendar dates such as signal months are CalendarDate columns)
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=ORJSON_OPTIONS), mimetype='application/json')
+
+
 # Initialize Flask app
 app = Flask(__name__, static_folder='static', static_url_path='/static')
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///candlestick_alerts.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'query_cache_size': 1200,  # compiled-statement cache (SQLAlchemy default is 500)
+    'pool_pre_ping': True
+}
 
 # Email Configuration
 app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
@@ -51,19 +93,100 @@ app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
 app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER', os.getenv('MAIL_USERNAME'))
 
-# Initialize extensions
-db = SQLAlchemy(app)
+# Initialize extensions (sessions are removed on app-context teardown by Flask-SQLAlchemy;
+# objects keep their loaded state after commit instead of reloading on next access)
+db = SQLAlchemy(app, session_options={'expire_on_commit': False})
 mail = Mail(app)
 
+# SQLite tuning; PRAGMAs are per-connection so they are applied on every connect
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'temp_store=MEMORY',
+    'mmap_size=268435456',
+    'cache_size=-65536',
+    'busy_timeout=5000',
+)
+
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """Apply SQLITE_PRAGMAS to a new DBAPI connection."""
+    cursor = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', _set_sqlite_pragmas)
+
 # Initialize analyzer
 USE_MOCK_DATA = os.getenv('USE_MOCK_DATA', 'true').lower() == 'true'
 analyzer = CandlestickAnalyzer(use_mock_data=USE_MOCK_DATA)
+NSE_STOCK_COUNT = len(get_nse_stock_list())
+
+# Scans still 'running' after this long are assumed lost (e.g. worker restart)
+SCAN_TIMEOUT_MINUTES = int(os.getenv('SCAN_TIMEOUT_MINUTES', 30))
+
+# Dashboard payload cache (cleared whenever a scan commits new data)
+_dashboard_cache = TTLCache(maxsize=1, ttl=30)
+_dashboard_cache_lock = threading.Lock()
+
+# Per-symbol analysis and chart caches. They are per process: a scan commit
+# clears them only in the worker that ran the scan, so other gunicorn workers
+# may serve pre-scan results until the (short) TTL expires
+_analysis_cache = TTLCache(maxsize=2048, ttl=60)
+_analysis_cache_lock = threading.Lock()
+_chart_cache = TTLCache(maxsize=2048, ttl=60)
+_chart_cache_lock = threading.Lock()
+
+
+def cacheable(max_age):
+    """
+    Decorator for read-only GET endpoints: adds Cache-Control and an ETag
+    so clients can revalidate with If-None-Match and receive a 304.
+    
+    Args:
+        max_age: Seconds clients may reuse the response without revalidating
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            
+            response.headers['Cache-Control'] = f'public, max-age={max_age}'
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
 
 
 # ==================== Database Models ====================
 
+class CalendarDate(TypeDecorator):
+    """
+    DATETIME column holding a calendar date (e.g. a signal month's first day).
+    
+    Values are read back as date objects, so the API sends them as
+    YYYY-MM-DD rather than as midnight UTC instants.
+    """
+    impl = DateTime
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, date) and not isinstance(value, datetime):
+            return datetime.combine(value, datetime.min.time())
+        return value
+    
+    def process_result_value(self, value, dialect):
+        return value.date() if value is not None else None
+
+
 def send_alert_email(alerts):
-    """Send email notification for new alerts."""
+    """Send email notification for new alerts (list of alert mappings)."""
     try:
         # Get email settings
         enable_alerts = Settings.query.filter_by(key='enable_email_alerts').first()
@@ -80,8 +203,8 @@ def send_alert_email(alerts):
             return
         
         # Prepare email content
-        buy_signals = [a for a in alerts if a.alert_type == 'BUY']
-        sell_signals = [a for a in alerts if a.alert_type == 'SELL']
+        buy_signals = [a for a in alerts if a['alert_type'] == 'BUY']
+        sell_signals = [a for a in alerts if a['alert_type'] == 'SELL']
         
         body = f"""CandleAlert - New Trading Signals Detected
 
@@ -95,12 +218,12 @@ Scan Summary:
         if buy_signals:
             body += "\n🟢 BUY SIGNALS:\n"
             for alert in buy_signals[:10]:  # Top 10
-                body += f"  • {alert.symbol}: ₹{alert.current_close:.2f} (Strength: {alert.strength:.2f}%)\n"
+                body += f"  • {alert['symbol']}: ₹{alert['current_close']:.2f} (Strength: {alert['strength']:.2f}%)\n"
         
         if sell_signals:
             body += "\n🔴 SELL SIGNALS:\n"
             for alert in sell_signals[:10]:  # Top 10
-                body += f"  • {alert.symbol}: ₹{alert.current_close:.2f} (Strength: {alert.strength:.2f}%)\n"
+                body += f"  • {alert['symbol']}: ₹{alert['current_close']:.2f} (Strength: {alert['strength']:.2f}%)\n"
         
         body += "\n\nView full details at: http://localhost:5000\n"
         
@@ -119,13 +242,19 @@ Scan Summary:
 
 class Stock(db.Model):
     """Stock model for tracking analyzed stocks."""
+    __table_args__ = (
+        db.Index('ix_stock_updated_id', 'last_updated', 'id'),
+        db.Index('ix_stock_trend_updated', 'current_trend', 'last_updated'),
+        db.Index('ix_stock_signal', 'last_signal_type'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     symbol = db.Column(db.String(20), unique=True, nullable=False)
     name = db.Column(db.String(100))
     current_price = db.Column(db.Float)
     current_trend = db.Column(db.String(20))
     last_signal_type = db.Column(db.String(10))
-    last_signal_date = db.Column(db.DateTime)
+    last_signal_date = db.Column(CalendarDate)
     price_change_pct = db.Column(db.Float)
     last_updated = db.Column(db.DateTime, default=utcnow)
     
@@ -137,18 +266,25 @@ class Stock(db.Model):
             'current_price': self.current_price,
             'current_trend': self.current_trend,
             'last_signal_type': self.last_signal_type,
-            'last_signal_date': self.last_signal_date.isoformat() if self.last_signal_date else None,
+            'last_signal_date': self.last_signal_date,
             'price_change_pct': self.price_change_pct,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None
+            'last_updated': self.last_updated
         }
 
 
 class Alert(db.Model):
     """Alert model for storing generated signals."""
+    __table_args__ = (
+        db.Index('ix_alert_created_id', 'created_at', 'id'),
+        db.Index('ix_alert_type_created', 'alert_type', 'created_at'),
+        db.Index('ix_alert_type_strength', 'alert_type', 'strength'),
+        db.Index('ix_alert_symbol_signal_date', 'symbol', 'signal_date'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     symbol = db.Column(db.String(20), nullable=False)
     alert_type = db.Column(db.String(10), nullable=False)  # BUY or SELL
-    signal_date = db.Column(db.DateTime, nullable=False)
+    signal_date = db.Column(CalendarDate, nullable=False)
     current_close = db.Column(db.Float)
     current_open = db.Column(db.Float)
     prev_open = db.Column(db.Float)
@@ -163,7 +299,7 @@ class Alert(db.Model):
             'id': self.id,
             'symbol': self.symbol,
             'alert_type': self.alert_type,
-            'signal_date': self.signal_date.isoformat() if self.signal_date else None,
+            'signal_date': self.signal_date,
             'current_close': self.current_close,
             'current_open': self.current_open,
             'prev_open': self.prev_open,
@@ -171,7 +307,7 @@ class Alert(db.Model):
             'strength': self.strength,
             'reason': self.reason,
             'is_notified': self.is_notified,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 
@@ -187,12 +323,16 @@ class Settings(db.Model):
             'id': self.id,
             'key': self.key,
             'value': self.value,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at
         }
 
 
 class ScanHistory(db.Model):
     """Scan history for tracking scan operations."""
+    __table_args__ = (
+        db.Index('ix_scan_history_created', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     scan_type = db.Column(db.String(20))  # 'manual' or 'scheduled'
     total_stocks = db.Column(db.Integer)
@@ -200,21 +340,153 @@ class ScanHistory(db.Model):
     sell_signals = db.Column(db.Integer)
     errors = db.Column(db.Integer)
     duration_seconds = db.Column(db.Float)
+    status = db.Column(db.String(20), default='completed')  # 'running', 'completed' or 'failed'
     created_at = db.Column(db.DateTime, default=utcnow)
     
     def to_dict(self):
         return {
             'id': self.id,
             'scan_type': self.scan_type,
+            'status': self.status,
             'total_stocks': self.total_stocks,
             'buy_signals': self.buy_signals,
             'sell_signals': self.sell_signals,
             'errors': self.errors,
             'duration_seconds': self.duration_seconds,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
+        }
+
+
+class ScanResult(db.Model):
+    """Per-stock result of a single scan."""
+    __table_args__ = (
+        db.Index('ix_scan_result_scan', 'scan_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    scan_id = db.Column(db.Integer, db.ForeignKey('scan_history.id'), nullable=False)
+    symbol = db.Column(db.String(20), nullable=False)
+    current_price = db.Column(db.Float)
+    current_trend = db.Column(db.String(10))
+    price_change_pct = db.Column(db.Float)
+    signal_type = db.Column(db.String(10))  # BUY, SELL or None
+    signal_date = db.Column(CalendarDate)
+    signal_strength = db.Column(db.Float)
+    signal_reason = db.Column(db.Text)
+    
+    def to_dict(self):
+        """Shape the row like an analyzer result so the scan table can render it."""
+        return {
+            'symbol': self.symbol,
+            'current_price': self.current_price,
+            'current_trend': self.current_trend,
+            'price_change_pct': self.price_change_pct,
+            'latest_signal': {
+                'type': self.signal_type,
+                'date': self.signal_date,
+                'strength': self.signal_strength,
+                'reason': self.signal_reason
+            } if self.signal_type else None
         }
 
 
+# Columns projected by the read endpoints (Core rows, no ORM objects)
+STOCK_COLUMNS = (
+    Stock.id, Stock.symbol, Stock.name, Stock.current_price, Stock.current_trend,
+    Stock.last_signal_type, Stock.last_signal_date, Stock.price_change_pct, Stock.last_updated
+)
+ALERT_COLUMNS = (
+    Alert.id, Alert.symbol, Alert.alert_type, Alert.signal_date, Alert.current_close,
+    Alert.current_open, Alert.prev_open, Alert.prev_close, Alert.strength, Alert.reason,
+    Alert.is_notified, Alert.created_at
+)
+
+
+def _fetch_rows(stmt):
+    """Execute a Core select and return its rows as plain dicts."""
+    return [dict(row) for row in db.session.execute(stmt).mappings()]
+
+
+def _fetch_scan(scan_id=None):
+    """Fetch a scan history row as a dict (the most recent one if scan_id is None)."""
+    table = ScanHistory.__table__
+    stmt = select(table)
+    if scan_id is not None:
+        stmt = stmt.where(table.c.id == scan_id)
+    else:
+        stmt = stmt.order_by(table.c.created_at.desc()).limit(1)
+    row = db.session.execute(stmt).mappings().first()
+    if not row:
+        return None
+    
+    scan = dict(row)
+    # Report lost scans as failed without writing on this (polled) read path
+    if scan['status'] == 'running' and scan['created_at'].replace(tzinfo=timezone.utc) < _stale_scan_cutoff():
+        scan['status'] = 'failed'
+    return scan
+
+
+def _stale_scan_cutoff():
+    """Creation time before which a scan still marked 'running' is considered lost."""
+    return utcnow() - timedelta(minutes=SCAN_TIMEOUT_MINUTES)
+
+
+def _fail_stale_scans():
+    """Mark scans left 'running' for longer than SCAN_TIMEOUT_MINUTES as failed."""
+    table = ScanHistory.__table__
+    result = db.session.execute(
+        update(table)
+        .where(table.c.status == 'running', table.c.created_at < _stale_scan_cutoff())
+        .values(status='failed')
+    )
+    db.session.commit()
+    if result.rowcount:
+        logger.warning(f"Marked {result.rowcount} stale running scan(s) as failed")
+
+
+def _encode_cursor(sort_value, row_id):
+    """Encode a keyset pagination cursor from the last row's sort value and id."""
+    return base64.urlsafe_b64encode(f"{sort_value.isoformat()}:{row_id}".encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """
+    Decode a cursor produced by _encode_cursor into (sort_value, id).
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort_value, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit(':', 1)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except ValueError as e:  # includes binascii.Error and UnicodeDecodeError
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+
+def _fetch_keyset_page(stmt, sort_column, id_column, cursor, per_page):
+    """
+    Fetch one page of a Core select ordered by (sort_column, id) descending.
+    
+    Uses keyset pagination, so the cost does not grow with page depth and no
+    COUNT query is needed.
+    
+    Returns:
+        Tuple of (rows as dicts, cursor for the next page or None)
+    """
+    per_page = max(per_page, 1)
+    if cursor:
+        sort_value, row_id = _decode_cursor(cursor)
+        stmt = stmt.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    
+    # Fetch one extra row to know whether another page exists
+    rows = _fetch_rows(stmt.order_by(sort_column.desc(), id_column.desc()).limit(per_page + 1))
+    if len(rows) <= per_page:
+        return rows, None
+    
+    rows = rows[:per_page]
+    return rows, _encode_cursor(rows[-1][sort_column.key], rows[-1][id_column.key])
+
+
 # ==================== API Routes ====================
 
 @app.route('/')
@@ -228,44 +500,60 @@ def health_check():
     """Health check endpoint."""
     return jsonify({
         'status': 'healthy',
-        'timestamp': utcnow().isoformat(),
+        'timestamp': utcnow(),
         'version': '1.0.0'
     })
 
 
+@cached(_dashboard_cache, key=lambda: 'v', lock=_dashboard_cache_lock)
+def _build_dashboard_payload():
+    """Build the serialized dashboard payload (memoized in _dashboard_cache)."""
+    # Stock total and per-type alert counts in a single round-trip
+    total_stocks, buy_alerts, sell_alerts = db.session.execute(
+        select(
+            select(func.count(Stock.id)).scalar_subquery(),
+            func.count(case((Alert.alert_type == 'BUY', 1))),
+            func.count(case((Alert.alert_type == 'SELL', 1)))
+        ).select_from(Alert)
+    ).one()
+    
+    # Recent alerts
+    recent_alerts = _fetch_rows(select(*ALERT_COLUMNS).order_by(Alert.created_at.desc()).limit(10))
+    
+    # Top affected stocks (by signal strength)
+    top_buy = _fetch_rows(
+        select(*ALERT_COLUMNS).where(Alert.alert_type == 'BUY').order_by(Alert.strength.desc()).limit(5)
+    )
+    top_sell = _fetch_rows(
+        select(*ALERT_COLUMNS).where(Alert.alert_type == 'SELL').order_by(Alert.strength.desc()).limit(5)
+    )
+    
+    # Last scan info
+    last_scan = _fetch_scan()
+    
+    return {
+        'success': True,
+        'data': {
+            'summary': {
+                'total_stocks': total_stocks or NSE_STOCK_COUNT,
+                'buy_signals': buy_alerts,
+                'sell_signals': sell_alerts,
+                'total_alerts': buy_alerts + sell_alerts
+            },
+            'recent_alerts': recent_alerts,
+            'top_buy_signals': top_buy,
+            'top_sell_signals': top_sell,
+            'last_scan': last_scan
+        }
+    }
+
+
 @app.route('/api/dashboard', methods=['GET'])
+@cacheable(30)
 def get_dashboard():
     """Get dashboard summary data."""
     try:
-        total_stocks = Stock.query.count()
-        buy_alerts = Alert.query.filter_by(alert_type='BUY').count()
-        sell_alerts = Alert.query.filter_by(alert_type='SELL').count()
-        
-        # Recent alerts
-        recent_alerts = Alert.query.order_by(Alert.created_at.desc()).limit(10).all()
-        
-        # Top affected stocks (by signal strength)
-        top_buy = Alert.query.filter_by(alert_type='BUY').order_by(Alert.strength.desc()).limit(5).all()
-        top_sell = Alert.query.filter_by(alert_type='SELL').order_by(Alert.strength.desc()).limit(5).all()
-        
-        # Last scan info
-        last_scan = ScanHistory.query.order_by(ScanHistory.created_at.desc()).first()
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'summary': {
-                    'total_stocks': total_stocks or len(get_nse_stock_list()),
-                    'buy_signals': buy_alerts,
-                    'sell_signals': sell_alerts,
-                    'total_alerts': buy_alerts + sell_alerts
-                },
-                'recent_alerts': [a.to_dict() for a in recent_alerts],
-                'top_buy_signals': [a.to_dict() for a in top_buy],
-                'top_sell_signals': [a.to_dict() for a in top_sell],
-                'last_scan': last_scan.to_dict() if last_scan else None
-            }
-        })
+        return jsonify(_build_dashboard_payload())
     except Exception as e:
         logger.error(f"Dashboard error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -273,44 +561,81 @@ def get_dashboard():
 
 @app.route('/api/stocks', methods=['GET'])
 def get_stocks():
-    """Get all tracked stocks."""
+    """Get all tracked stocks (keyset-paginated via ?cursor=)."""
     try:
-        page = request.args.get('page', 1, type=int)
+        cursor = request.args.get('cursor')
         per_page = request.args.get('per_page', 50, type=int)
         trend_filter = request.args.get('trend')
         signal_filter = request.args.get('signal')
         
-        query = Stock.query
+        stmt = select(*STOCK_COLUMNS)
         
         if trend_filter:
-            query = query.filter_by(current_trend=trend_filter)
+            stmt = stmt.where(Stock.current_trend == trend_filter)
         if signal_filter:
-            query = query.filter_by(last_signal_type=signal_filter)
+            stmt = stmt.where(Stock.last_signal_type == signal_filter)
             
-        stocks = query.order_by(Stock.last_updated.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        stocks, next_cursor = _fetch_keyset_page(stmt, Stock.last_updated, Stock.id, cursor, per_page)
         
         return jsonify({
             'success': True,
             'data': {
-                'stocks': [s.to_dict() for s in stocks.items],
-                'total': stocks.total,
-                'pages': stocks.pages,
-                'current_page': page
+                'stocks': stocks,
+                'next_cursor': next_cursor
             }
         })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Get stocks error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _cached_unless_failed(cache, lock, failed):
+    """
+    Memoize a one-argument function per symbol, like cachetools.cached,
+    except that results for which failed(result) is true are not stored.
+    
+    Args:
+        cache: TTLCache holding the results
+        lock: Lock guarding the cache
+        failed: Predicate marking results that should be recomputed next time
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(symbol):
+            with lock:
+                result = cache.get(symbol)
+            if result is not None:
+                return result
+            
+            result = f(symbol)
+            if not failed(result):
+                with lock:
+                    cache[symbol] = result
+            return result
+        return wrapper
+    return decorator
+
+
+@_cached_unless_failed(_analysis_cache, _analysis_cache_lock, lambda analysis: analysis.get('status') == 'error')
+def _analyze(symbol):
+    """Analyze a stock (memoized per symbol in _analysis_cache unless it failed)."""
+    return analyzer.analyze_stock(symbol)
+
+
+@_cached_unless_failed(_chart_cache, _chart_cache_lock, lambda chart_data: not chart_data)
+def _chart(symbol):
+    """Build chart data for a stock (memoized per symbol in _chart_cache unless it failed)."""
+    return analyzer.get_stock_chart_data(symbol)
+
+
 @app.route('/api/stocks/<symbol>', methods=['GET'])
 def get_stock(symbol):
     """Get detailed analysis for a specific stock."""
     try:
-        analysis = analyzer.analyze_stock(symbol.upper())
-        chart_data = analyzer.get_stock_chart_data(symbol.upper())
+        analysis = _analyze(symbol.upper())
+        chart_data = _chart(symbol.upper())
         
         return jsonify({
             'success': True,
@@ -326,39 +651,45 @@ def get_stock(symbol):
 
 @app.route('/api/alerts', methods=['GET'])
 def get_alerts():
-    """Get all alerts with optional filtering."""
+    """Get all alerts with optional filtering (keyset-paginated via ?cursor=; the first page includes the total)."""
     try:
-        page = request.args.get('page', 1, type=int)
+        cursor = request.args.get('cursor')
         per_page = request.args.get('per_page', 50, type=int)
         alert_type = request.args.get('type')
         symbol = request.args.get('symbol')
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        query = Alert.query
+        stmt = select(*ALERT_COLUMNS)
         
         if alert_type:
-            query = query.filter_by(alert_type=alert_type.upper())
+            stmt = stmt.where(Alert.alert_type == alert_type.upper())
         if symbol:
-            query = query.filter_by(symbol=symbol.upper())
+            stmt = stmt.where(Alert.symbol == symbol.upper())
         if start_date:
-            query = query.filter(Alert.signal_date >= datetime.fromisoformat(start_date))
+            stmt = stmt.where(Alert.signal_date >= datetime.fromisoformat(start_date))
         if end_date:
-            query = query.filter(Alert.signal_date <= datetime.fromisoformat(end_date))
+            stmt = stmt.where(Alert.signal_date <= datetime.fromisoformat(end_date))
             
-        alerts = query.order_by(Alert.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        alerts, next_cursor = _fetch_keyset_page(stmt, Alert.created_at, Alert.id, cursor, per_page)
+        
+        # Count matching alerts once, on the first page; later pages only need the cursor
+        total = None
+        if not cursor:
+            total = len(alerts) if next_cursor is None else db.session.scalar(
+                select(func.count()).select_from(stmt.subquery())
+            )
         
         return jsonify({
             'success': True,
             'data': {
-                'alerts': [a.to_dict() for a in alerts.items],
-                'total': alerts.total,
-                'pages': alerts.pages,
-                'current_page': page
+                'alerts': alerts,
+                'total': total,
+                'next_cursor': next_cursor
             }
         })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Get alerts error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -366,105 +697,197 @@ def get_alerts():
 
 @app.route('/api/alerts/export', methods=['GET'])
 def export_alerts():
-    """Export alerts to JSON format."""
+    """Export alerts to JSON format (streamed in batches of rows)."""
     try:
         alert_type = request.args.get('type')
-        query = Alert.query
+        stmt = select(*ALERT_COLUMNS).order_by(Alert.created_at.desc())
         
         if alert_type:
-            query = query.filter_by(alert_type=alert_type.upper())
+            stmt = stmt.where(Alert.alert_type == alert_type.upper())
             
-        alerts = query.order_by(Alert.created_at.desc()).all()
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'alerts': [a.to_dict() for a in alerts],
-                'exported_at': utcnow().isoformat(),
-                'total': len(alerts)
-            }
-        })
+        result = db.session.execute(stmt.execution_options(yield_per=1000)).mappings()
     except Exception as e:
         logger.error(f"Export alerts error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
+    
+    def generate():
+        yield b'{"success":true,"data":{"exported_at":' + orjson.dumps(utcnow(), option=ORJSON_OPTIONS) + b',"alerts":['
+        total = 0
+        for batch in result.partitions():
+            if total:
+                yield b','
+            yield b','.join(orjson.dumps(dict(row), option=ORJSON_OPTIONS) for row in batch)
+            total += len(batch)
+        yield b'],"total":' + str(total).encode() + b'}}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+# Dialect-specific INSERT constructs that support ON CONFLICT upserts
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert
+}
+
+
+def _persist_scan(results, scan_id, duration):
+    """
+    Write a scan's stocks, alerts, per-stock results and history row in a single transaction
+    and invalidate cached read payloads. Shared by manual and scheduled scans.
+    
+    Bypasses the ORM session: stocks are upserted on symbol and alerts are
+    inserted with executemany-style Core statements on one connection.
+    
+    Args:
+        results: Output of CandlestickAnalyzer.scan_all_stocks
+        scan_id: Id of the 'running' ScanHistory row to complete
+        duration: Scan duration in seconds
+        
+    Returns:
+        List of inserted alert mappings
+    """
+    now = utcnow()
+    stock_rows, alert_rows, result_rows = [], [], []
+    for stock_data in results['all_stocks']:
+        signal = stock_data['latest_signal']
+        signal_date = datetime.fromisoformat(signal['date']) if signal else None
+        result_rows.append({
+            'scan_id': scan_id,
+            'symbol': stock_data['symbol'],
+            'current_price': stock_data['current_price'],
+            'current_trend': stock_data['current_trend'],
+            'price_change_pct': stock_data['price_change_pct'],
+            'signal_type': signal['type'] if signal else None,
+            'signal_date': signal_date,
+            'signal_strength': signal['strength'] if signal else None,
+            'signal_reason': signal['reason'] if signal else None
+        })
+        stock_rows.append({
+            'symbol': stock_data['symbol'],
+            'current_price': stock_data['current_price'],
+            'current_trend': stock_data['current_trend'],
+            'price_change_pct': stock_data['price_change_pct'],
+            'last_signal_type': signal['type'] if signal else None,
+            'last_signal_date': signal_date,
+            'last_updated': now
+        })
+        
+        if signal:
+            alert_rows.append({
+                'symbol': signal['symbol'],
+                'alert_type': signal['type'],
+                'signal_date': signal_date,
+                'current_close': signal['current_close'],
+                'current_open': signal['current_open'],
+                'prev_open': signal['prev_open'],
+                'prev_close': signal['prev_close'],
+                'strength': signal['strength'],
+                'reason': signal['reason']
+            })
+    
+    stock_table = Stock.__table__
+    with db.engine.begin() as conn:
+        if stock_rows:
+            upsert = UPSERT_INSERTS[conn.dialect.name](stock_table)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=[stock_table.c.symbol],
+                set_={
+                    'current_price': upsert.excluded.current_price,
+                    'current_trend': upsert.excluded.current_trend,
+                    'price_change_pct': upsert.excluded.price_change_pct,
+                    'last_updated': upsert.excluded.last_updated,
+                    # Keep the previous signal when this scan produced none
+                    'last_signal_type': func.coalesce(upsert.excluded.last_signal_type, stock_table.c.last_signal_type),
+                    'last_signal_date': func.coalesce(upsert.excluded.last_signal_date, stock_table.c.last_signal_date)
+                }
+            )
+            conn.execute(upsert, stock_rows)
+        if alert_rows:
+            conn.execute(Alert.__table__.insert(), alert_rows)
+        if result_rows:
+            conn.execute(ScanResult.__table__.insert(), result_rows)
+        conn.execute(
+            update(ScanHistory.__table__)
+            .where(ScanHistory.__table__.c.id == scan_id)
+            .values(
+                status='completed',
+                total_stocks=results['summary']['total_scanned'],
+                buy_signals=results['summary']['buy_signals_count'],
+                sell_signals=results['summary']['sell_signals_count'],
+                errors=results['summary']['error_count'],
+                duration_seconds=duration
+            )
+        )
+    
+    # Writes bypassed the session; make sure it doesn't serve stale objects
+    db.session.expire_all()
+    _dashboard_cache.clear()
+    _analysis_cache.clear()
+    _chart_cache.clear()
+    
+    return alert_rows
+
+
+def _start_scan_record(scan_type):
+    """Insert a ScanHistory row with status 'running' and return its id."""
+    _fail_stale_scans()
+    record = ScanHistory(scan_type=scan_type, status='running')
+    db.session.add(record)
+    db.session.commit()
+    return record.id
+
+
+def _run_scan_job(scan_id, stock_list=None):
+    """Run a scan and persist its results into the given ScanHistory row."""
+    with app.app_context():
+        try:
+            start_time = utcnow()
+            results = analyzer.scan_all_stocks(stock_list)
+            duration = (utcnow() - start_time).total_seconds()
+            
+            # Save stocks, alerts and scan history
+            new_alerts = _persist_scan(results, scan_id, duration)
+            
+            # Send email notification for new alerts
+            if new_alerts:
+                send_alert_email(new_alerts)
+            
+            logger.info(f"Scan {scan_id} completed. {results['summary']['total_scanned']} stocks processed.")
+            
+        except Exception as e:
+            logger.error(f"Scan {scan_id} error: {str(e)}")
+            db.session.rollback()
+            db.session.execute(update(ScanHistory).where(ScanHistory.id == scan_id).values(status='failed'))
+            db.session.commit()
 
 
 @app.route('/api/scan', methods=['POST'])
 def run_scan():
-    """Run a manual stock scan."""
+    """Queue a manual stock scan; poll /api/scan/progress?scan_id= for the result."""
     try:
-        start_time = utcnow()
-        
         # Get optional stock list from request (silent=True to handle empty body)
         data = request.get_json(silent=True) or {}
         stock_list = data.get('stocks')
         
-        # Run the scan
-        results = analyzer.scan_all_stocks(stock_list)
+        scan_id = _start_scan_record('manual')
         
-        # Calculate duration
-        duration = (utcnow() - start_time).total_seconds()
-        
-        # Save scan history
-        scan_record = ScanHistory(
-            scan_type='manual',
-            total_stocks=results['summary']['total_scanned'],
-            buy_signals=results['summary']['buy_signals_count'],
-            sell_signals=results['summary']['sell_signals_count'],
-            errors=results['summary']['error_count'],
-            duration_seconds=duration
+        # Run the scan off the request thread
+        start_scheduler()
+        scheduler.add_job(
+            _run_scan_job,
+            'date',
+            args=[scan_id, stock_list],
+            id=f'manual_scan_{scan_id}',
+            misfire_grace_time=None
         )
-        db.session.add(scan_record)
-        
-        # Save/update stocks and alerts
-        new_alerts = []
-        for stock_data in results['all_stocks']:
-            stock = Stock.query.filter_by(symbol=stock_data['symbol']).first()
-            if not stock:
-                stock = Stock(symbol=stock_data['symbol'])
-                
-            stock.current_price = stock_data['current_price']
-            stock.current_trend = stock_data['current_trend']
-            stock.price_change_pct = stock_data['price_change_pct']
-            stock.last_updated = utcnow()
-            
-            if stock_data['latest_signal']:
-                signal = stock_data['latest_signal']
-                stock.last_signal_type = signal['type']
-                stock.last_signal_date = datetime.fromisoformat(signal['date'])
-                
-                # Create alert
-                alert = Alert(
-                    symbol=signal['symbol'],
-                    alert_type=signal['type'],
-                    signal_date=datetime.fromisoformat(signal['date']),
-                    current_close=signal['current_close'],
-                    current_open=signal['current_open'],
-                    prev_open=signal['prev_open'],
-                    prev_close=signal['prev_close'],
-                    strength=signal['strength'],
-                    reason=signal['reason']
-                )
-                db.session.add(alert)
-                new_alerts.append(alert)
-            
-            db.session.add(stock)
-        
-        db.session.commit()
-        
-        # Send email notification for new alerts
-        if new_alerts:
-            send_alert_email(new_alerts)
         
         return jsonify({
             'success': True,
             'data': {
-                'summary': results['summary'],
-                'duration_seconds': duration,
-                'buy_signals': results['buy_signals'][:10],  # Top 10
-                'sell_signals': results['sell_signals'][:10]  # Top 10
+                'scan_id': scan_id,
+                'status': 'running'
             }
-        })
+        }), 202
     except Exception as e:
         logger.error(f"Scan error: {str(e)}")
         db.session.rollback()
@@ -473,16 +896,45 @@ def run_scan():
 
 @app.route('/api/scan/progress', methods=['GET'])
 def get_scan_progress():
-    """Get the current scan progress (for real-time updates)."""
-    # This would be implemented with WebSockets or SSE for real-time updates
-    # For now, return the last scan status
-    last_scan = ScanHistory.query.order_by(ScanHistory.created_at.desc()).first()
+    """Get the status of a scan (?scan_id=), or of the most recent scan."""
+    scan_id = request.args.get('scan_id', type=int)
+    
+    scan = _fetch_scan(scan_id)
+    if scan_id is not None and not scan:
+        return jsonify({'success': False, 'error': f'Scan {scan_id} not found'}), 404
+    
     return jsonify({
         'success': True,
-        'data': last_scan.to_dict() if last_scan else None
+        'data': scan
     })
 
 
+@app.route('/api/scan/<int:scan_id>/results', methods=['GET'])
+def get_scan_results(scan_id):
+    """Get the per-stock results persisted by a scan, signals first by strength."""
+    try:
+        scan = _fetch_scan(scan_id)
+        if not scan:
+            return jsonify({'success': False, 'error': f'Scan {scan_id} not found'}), 404
+        
+        results = ScanResult.query.filter_by(scan_id=scan_id).order_by(
+            case((ScanResult.signal_type.is_(None), 1), else_=0),
+            ScanResult.signal_strength.desc(),
+            ScanResult.symbol
+        ).all()
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'scan': scan,
+                'results': [r.to_dict() for r in results]
+            }
+        })
+    except Exception as e:
+        logger.error(f"Scan results error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/settings', methods=['GET'])
 def get_settings():
     """Get all application settings."""
@@ -563,6 +1015,7 @@ def test_email():
 
 
 @app.route('/api/stock-list', methods=['GET'])
+@cacheable(86400)
 def get_stock_list():
     """Get the list of available NSE stocks."""
     return jsonify({
@@ -572,10 +1025,11 @@ def get_stock_list():
 
 
 @app.route('/api/chart/<symbol>', methods=['GET'])
+@cacheable(30)
 def get_chart_data(symbol):
     """Get chart data for a specific stock."""
     try:
-        chart_data = analyzer.get_stock_chart_data(symbol.upper())
+        chart_data = _chart(symbol.upper())
         
         if not chart_data:
             return jsonify({
@@ -598,80 +1052,83 @@ def scheduled_monthly_scan():
     """Run automated monthly scan on the 1st of each month."""
     logger.info("Running scheduled monthly scan...")
     with app.app_context():
-        try:
-            start_time = utcnow()
-            results = analyzer.scan_all_stocks()
-            duration = (utcnow() - start_time).total_seconds()
-            
-            # Save scan history
-            scan_record = ScanHistory(
-                scan_type='scheduled',
-                total_stocks=results['summary']['total_scanned'],
-                buy_signals=results['summary']['buy_signals_count'],
-                sell_signals=results['summary']['sell_signals_count'],
-                errors=results['summary']['error_count'],
-                duration_seconds=duration
-            )
-            db.session.add(scan_record)
-            
-            # Process results (similar to manual scan)
-            new_alerts = []
-            for stock_data in results['all_stocks']:
-                stock = Stock.query.filter_by(symbol=stock_data['symbol']).first()
-                if not stock:
-                    stock = Stock(symbol=stock_data['symbol'])
-                    
-                stock.current_price = stock_data['current_price']
-                stock.current_trend = stock_data['current_trend']
-                stock.price_change_pct = stock_data['price_change_pct']
-                stock.last_updated = utcnow()
-                
-                if stock_data['latest_signal']:
-                    signal = stock_data['latest_signal']
-                    stock.last_signal_type = signal['type']
-                    stock.last_signal_date = datetime.fromisoformat(signal['date'])
-                    
-                    alert = Alert(
-                        symbol=signal['symbol'],
-                        alert_type=signal['type'],
-                        signal_date=datetime.fromisoformat(signal['date']),
-                        current_close=signal['current_close'],
-                        current_open=signal['current_open'],
-                        prev_open=signal['prev_open'],
-                        prev_close=signal['prev_close'],
-                        strength=signal['strength'],
-                        reason=signal['reason']
-                    )
-                    db.session.add(alert)
-                    new_alerts.append(alert)
-                
-                db.session.add(stock)
-            
-            db.session.commit()
-            
-            # Send email notification for new alerts
-            if new_alerts:
-                send_alert_email(new_alerts)
-            
-            logger.info(f"Scheduled scan completed. {results['summary']['total_scanned']} stocks processed.")
-            
-        except Exception as e:
-            logger.error(f"Scheduled scan error: {str(e)}")
-            db.session.rollback()
+        scan_id = _start_scan_record('scheduled')
+    _run_scan_job(scan_id)
 
 
 # Initialize scheduler
-scheduler = BackgroundScheduler()
-# Run on the 1st of every month at 9:00 AM IST (3:30 AM UTC)
-scheduler.add_job(
-    scheduled_monthly_scan,
-    'cron',
-    day=1,
-    hour=3,
-    minute=30,
-    id='monthly_scan',
-    replace_existing=True
+# Manual scans are queued in the in-memory store of whichever process received
+# the request. The monthly cron job lives in a persistent store that is only
+# loaded by the one process holding SCHEDULER_LOCK_FILE: every process started
+# with RUN_SCHEDULER=true (e.g. each gunicorn worker) polls for the lock, and if
+# the holder exits the OS releases it and another process takes over.
+RUN_SCHEDULER = os.getenv('RUN_SCHEDULER', 'false').lower() == 'true'
+SCHEDULER_LOCK_FILE = os.getenv('SCHEDULER_LOCK_FILE', os.path.join(app.instance_path, 'scheduler.lock'))
+SCHEDULER_LOCK_RETRY_SECONDS = 60
+
+scheduler = BackgroundScheduler(
+    jobstores={'default': MemoryJobStore()},
+    executors={'default': ThreadPoolExecutor(4)},
+    job_defaults={'coalesce': True, 'max_instances': 1}
 )
+_scheduler_lock = threading.Lock()
+_scheduler_lock_file = None
+
+
+def start_scheduler():
+    """Start the background scheduler if it is not already running in this process."""
+    with _scheduler_lock:
+        if not scheduler.running:
+            scheduler.start()
+
+
+def _acquire_scheduler_lock():
+    """
+    Try to take the cross-process monthly scan lock without blocking.
+    
+    Returns:
+        True if this process now holds the lock (kept until the process exits)
+    """
+    global _scheduler_lock_file
+    if fcntl is None:
+        return True
+    
+    os.makedirs(os.path.dirname(SCHEDULER_LOCK_FILE), exist_ok=True)
+    lock_file = open(SCHEDULER_LOCK_FILE, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    
+    _scheduler_lock_file = lock_file
+    return True
+
+
+def _claim_monthly_scan():
+    """Wait for the scheduler lock, then register the monthly scan in this process."""
+    while not _acquire_scheduler_lock():
+        time.sleep(SCHEDULER_LOCK_RETRY_SECONDS)
+    
+    with app.app_context():
+        scheduler.add_jobstore(SQLAlchemyJobStore(engine=db.engine), 'persistent')
+    # Run on the 1st of every month at 9:00 AM IST (3:30 AM UTC)
+    scheduler.add_job(
+        scheduled_monthly_scan,
+        'cron',
+        day=1,
+        hour=3,
+        minute=30,
+        id='monthly_scan',
+        jobstore='persistent',
+        replace_existing=True
+    )
+    start_scheduler()
+    logger.info(f"Monthly scan scheduled in process {os.getpid()} for 1st of each month at 9:00 AM IST")
+
+
+if RUN_SCHEDULER:
+    threading.Thread(target=_claim_monthly_scan, name='monthly-scan-lock', daemon=True).start()
 
 
 # ==================== Error Handlers ====================
@@ -688,23 +1145,69 @@ def server_error(error):
 
 # ==================== Application Startup ====================
 
+SCHEMA_LOCK_FILE = os.path.join(app.instance_path, 'init_db.lock')
+
+
 def init_db():
-    """Initialize the database."""
-    with app.app_context():
-        db.create_all()
-        logger.info("Database initialized successfully")
+    """Initialize the database (serialized across processes that start together)."""
+    os.makedirs(app.instance_path, exist_ok=True)
+    with open(SCHEMA_LOCK_FILE, 'a') as lock_file:
+        if fcntl is not None:
+            # Gunicorn workers import the app at the same time; migrate one at a time
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        
+        with app.app_context():
+            db.create_all()
+            
+            # create_all() skips tables that already exist, so add any columns
+            # and indexes introduced after the database was first created
+            inspector = inspect(db.engine)
+            with db.engine.begin() as conn:
+                for table in db.metadata.sorted_tables:
+                    existing = {column['name'] for column in inspector.get_columns(table.name)}
+                    for column in table.columns:
+                        if column.name not in existing:
+                            column_type = column.type.compile(dialect=conn.dialect)
+                            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                            # Existing rows predate the column; give them its scalar default
+                            if column.default is not None and column.default.is_scalar:
+                                conn.execute(
+                                    update(table)
+                                    .where(column.is_(None))
+                                    .values({column.name: column.default.arg})
+                                )
+            
+            _fail_stale_scans()
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=db.engine, checkfirst=True)
+            
+            # Refresh planner statistics once at startup rather than on every scan
+            with db.engine.begin() as conn:
+                conn.execute(text('ANALYZE'))
+            
+            logger.info("Database initialized successfully")
+
+
+# Under a WSGI server (gunicorn -c gunicorn_conf.py app:app) the module is
+# imported rather than run, so create and migrate the schema on import
+if __name__ != '__main__':
+    init_db()
 
 
 if __name__ == '__main__':
     # Initialize database
     init_db()
     
-    # Start scheduler
-    scheduler.start()
-    logger.info("Scheduler started. Monthly scan scheduled for 1st of each month at 9:00 AM IST")
+    # Start scheduler (the monthly scan is registered by _claim_monthly_scan when enabled)
+    start_scheduler()
+    if not RUN_SCHEDULER:
+        logger.info("Scheduler started for manual scans. Set RUN_SCHEDULER=true to enable the monthly scan")
     
     # Run Flask app
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'true').lower() == 'true'
+    if not debug:
+        logger.warning("Flask's development server is not meant for production; use: gunicorn -c gunicorn_conf.py app:app")
     
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -0,0 +1,27 @@
+"""
+Candlestick Alert System - Gunicorn Configuration
+Production server settings. Run with: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+
+# ==================== SERVER ====================
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+
+# Threaded workers by default. yfinance fetches through curl_cffi, whose
+# blocking C calls are not made cooperative by gevent's monkey-patching, so a
+# scan running inside a gevent worker would stall every greenlet in that
+# worker. Set GUNICORN_WORKER_CLASS=gevent (and install gevent) when running
+# with USE_MOCK_DATA=true or another cooperative data source.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 500))
+
+# ==================== LOGGING ====================
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
@@ -8,18 +8,47 @@ Signal Logic:
 - Sell Signal: Previous month GREEN, Current month RED, Current close < Previous open
 """
 
+import functools
+import itertools
+import threading
+import zlib
 import pandas as pd
 import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dateutil.relativedelta import relativedelta
 import yfinance as yf
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; find_engulfing falls back to NumPy
+    njit = None
+
+from stock_cache import FileCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Root entropy for mock data; each symbol draws from its own child stream
+MOCK_DATA_SEED = 0
+
+
+@functools.lru_cache(maxsize=4)
+def _month_boundaries(year: int, month: int) -> Tuple[datetime, datetime]:
+    """Get the starts of the two complete months before (year, month) (memoized)."""
+    # First day of current month
+    first_of_this_month = datetime(year, month, 1)
+    # Last complete month
+    last_complete_month = first_of_this_month - relativedelta(months=1)
+    # Month before that
+    previous_month = last_complete_month - relativedelta(months=1)
+    
+    return previous_month, last_complete_month
+
 
 def get_last_two_complete_months() -> Tuple[datetime, datetime]:
     """
@@ -30,23 +59,122 @@ def get_last_two_complete_months() -> Tuple[datetime, datetime]:
         Tuple of (previous_month_start, current_month_start)
     """
     today = datetime.now()
-    # Get first day of current month
-    first_of_this_month = today.replace(day=1)
-    # Last complete month
-    last_complete_month = first_of_this_month - relativedelta(months=1)
-    # Month before that
-    previous_month = last_complete_month - relativedelta(months=1)
-    
-    return previous_month, last_complete_month
+    return _month_boundaries(today.year, today.month)
 
 
+@functools.lru_cache(maxsize=64)
 def get_month_name(date: datetime) -> str:
-    """Get month name and year from date."""
+    """Get month name and year from date (memoized)."""
     return date.strftime("%B %Y")
 
 
+def month_key(date: datetime) -> int:
+    """Get the number of months since the epoch (1970-01) for a date."""
+    return (date.year - 1970) * 12 + date.month - 1
+
+
+def first_row_in_month(month_keys: np.ndarray, month_start: datetime) -> Optional[int]:
+    """
+    Find the first row falling in a given month.
+    
+    Args:
+        month_keys: Sorted int64 month keys (see month_key)
+        month_start: Any datetime in the month to look up
+        
+    Returns:
+        Index of the month's first row, or None if the month is absent
+    """
+    key = month_key(month_start)
+    i = np.searchsorted(month_keys, key, side='left')
+    if i < len(month_keys) and month_keys[i] == key:
+        return int(i)
+    return None
+
+
+def compact_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store fetched candles in compact dtypes.
+    
+    Prices become float32 and dates second-resolution datetime64 (pandas has no
+    day unit). Volume stays int64, since monthly volumes can overflow int32.
+    
+    float32 keeps about 7 significant digits, so a price in the thousands is
+    stored to within ~0.0005. Yahoo prices are not 2-decimal; when one lies
+    that close to a rounding boundary, its displayed value (or a strength
+    derived from it) can differ by 0.01 from the float64 result. process_data
+    widens prices back to float64 so no further error accumulates in derived
+    values.
+    
+    Args:
+        df: OHLCV DataFrame with lowercase columns
+        
+    Returns:
+        DataFrame with compacted dtypes
+    """
+    df = df.astype({column: np.float32 for column in ('open', 'high', 'low', 'close')})
+    df['volume'] = df['volume'].fillna(0).astype(np.int64)
+    df['date'] = pd.to_datetime(df['date']).dt.as_unit('s')
+    return df
+
+
+# Candle colors indexed by sign + 1 (sign is -1 red, 0 neutral, +1 green)
+_SIGN_TO_COLOR = np.array(['red', 'neutral', 'green'])
+
+
+def _engulf_numpy(op: np.ndarray, cl: np.ndarray, sign: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find engulfing signals with vectorized NumPy masks.
+    
+    Args:
+        op: Open prices
+        cl: Close prices
+        sign: Candle direction (+1 green, -1 red, 0 neutral)
+        
+    Returns:
+        Tuple of (signal types: +1 BUY / -1 SELL, row indices), in row order
+    """
+    ig = sign == 1
+    ir = sign == -1
+    prev_op = np.roll(op, 1)
+    
+    # Buy: current green closes above previous red's open; Sell: the mirror image
+    buy_mask = ig & np.roll(ir, 1) & (cl > prev_op)
+    sell_mask = ir & np.roll(ig, 1) & (cl < prev_op)
+    buy_mask[:1] = False
+    sell_mask[:1] = False
+    
+    idx = np.flatnonzero(buy_mask | sell_mask)
+    return np.where(buy_mask[idx], 1, -1).astype(np.int8), idx
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_engulf(op, cl, sign, out_type, out_idx):
+        """Compiled single-pass engulfing scan; fills out_type/out_idx and returns the count."""
+        k = 0
+        for i in range(1, op.shape[0]):
+            if sign[i] == 1 and sign[i - 1] == -1 and cl[i] > op[i - 1]:
+                out_type[k] = 1
+                out_idx[k] = i
+                k += 1
+            elif sign[i] == -1 and sign[i - 1] == 1 and cl[i] < op[i - 1]:
+                out_type[k] = -1
+                out_idx[k] = i
+                k += 1
+        return k
+    
+    def find_engulfing(op: np.ndarray, cl: np.ndarray, sign: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Find engulfing signals (see _engulf_numpy) with the numba kernel."""
+        out_type = np.empty(op.shape[0], dtype=np.int8)
+        out_idx = np.empty(op.shape[0], dtype=np.int64)
+        k = _scan_engulf(op, cl, sign, out_type, out_idx)
+        return out_type[:k], out_idx[:k]
+else:
+    find_engulfing = _engulf_numpy
+
+
 # List of major NSE stocks (can be expanded)
-NSE_STOCKS = [
+NSE_STOCKS = (
     "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK",
     "HINDUNILVR", "SBIN", "BHARTIARTL", "KOTAKBANK", "BAJFINANCE",
     "ITC", "LT", "AXISBANK", "ASIANPAINT", "MARUTI",
@@ -57,7 +185,33 @@ NSE_STOCKS = [
     "DRREDDY", "CIPLA", "BRITANNIA", "EICHERMOT", "APOLLOHOSP",
     "HEROMOTOCO", "HINDALCO", "INDUSINDBK", "UPL", "SBILIFE",
     "BAJAJ-AUTO", "TATACONSUM", "M&M", "HDFC", "VEDL"
-]
+)
+
+# Yahoo Finance tickers (.NS suffix for NSE), built once
+NSE_TICKERS = tuple(f"{symbol}.NS" for symbol in NSE_STOCKS)
+_NSE_TICKER_BY_SYMBOL = dict(zip(NSE_STOCKS, NSE_TICKERS))
+
+
+def to_ticker(symbol: str) -> str:
+    """Get the Yahoo Finance ticker for an NSE symbol (e.g., 'RELIANCE' -> 'RELIANCE.NS')."""
+    return _NSE_TICKER_BY_SYMBOL.get(symbol) or f"{symbol}.NS"
+
+
+@dataclass
+class OHLCV:
+    """
+    Struct-of-arrays candle data for one symbol, used on the analysis hot path.
+    Dates are naive local datetime64 values in ascending order; month_key holds
+    the matching int64 months since the epoch for single-comparison month lookups.
+    """
+    date: np.ndarray
+    month_key: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    symbol: str
 
 
 class CandlestickAnalyzer:
@@ -66,15 +220,22 @@ class CandlestickAnalyzer:
     and generates buy/sell signals based on engulfing patterns.
     """
     
-    def __init__(self, use_mock_data: bool = False):
+    def __init__(self, use_mock_data: bool = False, cache: Optional[FileCache] = None):
         """
         Initialize the analyzer.
         
         Args:
             use_mock_data: If True, generates mock data instead of fetching real data
+            cache: On-disk cache for fetched data (defaults to a FileCache under .cache/)
         """
         self.use_mock_data = use_mock_data
+        self.cache = cache if cache is not None else FileCache()
         self.stocks_data: Dict[str, pd.DataFrame] = {}
+        # Guards stocks_data, which scan worker threads write concurrently
+        self._stocks_data_lock = threading.Lock()
+        # In-flight fetches keyed by (symbol, interval, start date, end date)
+        self._inflight: Dict[Tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
         
     def fetch_candlestick_data(
         self, 
@@ -98,14 +259,47 @@ class CandlestickAnalyzer:
         if self.use_mock_data:
             return self._generate_mock_data(symbol, start_date, end_date)
         
+        if start_date is None:
+            start_date = datetime.now() - timedelta(days=365 * 2)  # 2 years
+        if end_date is None:
+            end_date = datetime.now()
+        
+        # Coalesce concurrent identical fetches onto one in-flight Future
+        key = (symbol, interval, start_date.date(), end_date.date())
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not owner:
+            return future.result()
+        
         try:
-            # Add .NS suffix for NSE stocks
-            ticker = f"{symbol}.NS"
+            future.set_result(self._fetch_from_yahoo(symbol, start_date, end_date, interval))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        
+        return future.result()
+    
+    def _fetch_from_yahoo(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str
+    ) -> Optional[pd.DataFrame]:
+        """Fetch one symbol from the on-disk cache or Yahoo Finance (see fetch_candlestick_data)."""
+        try:
+            ticker = to_ticker(symbol)
             
-            if start_date is None:
-                start_date = datetime.now() - timedelta(days=365 * 2)  # 2 years
-            if end_date is None:
-                end_date = datetime.now()
+            cached = self.cache.get(symbol, interval, start_date, end_date)
+            if cached is not None:
+                return cached
             
             stock = yf.Ticker(ticker)
             df = stock.history(start=start_date, end=end_date, interval=interval)
@@ -125,9 +319,11 @@ class CandlestickAnalyzer:
             
             df['symbol'] = symbol
             df = df.reset_index()
-            df = df.rename(columns={'Date': 'date'})
+            df = compact_ohlcv(df.rename(columns={'Date': 'date'}))
             
-            self.stocks_data[symbol] = df
+            with self._stocks_data_lock:
+                self.stocks_data[symbol] = df
+            self.cache.set(symbol, interval, start_date, end_date, df)
             logger.info(f"Successfully fetched data for {symbol}")
             return df
             
@@ -135,25 +331,91 @@ class CandlestickAnalyzer:
             logger.error(f"Error fetching data for {symbol}: {str(e)}")
             return None
     
-    def _generate_mock_data(
-        self, 
-        symbol: str, 
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> pd.DataFrame:
+    def fetch_bulk(self, symbols: List[str], interval: str = "1mo", chunk_size: int = 20) -> Dict[str, pd.DataFrame]:
         """
-        Generate mock candlestick data for testing.
-        Ensures data includes the last 2 complete months (e.g., Nov 2025 and Dec 2025).
+        Fetch candlestick data for many symbols with batched yf.download calls.
+        Symbols with a fresh on-disk cache entry are not downloaded.
         
         Args:
-            symbol: Stock symbol
-            start_date: Start date
-            end_date: End date
+            symbols: Stock symbols (e.g., ['RELIANCE', 'TCS'])
+            interval: Data interval (default: 1mo for monthly)
+            chunk_size: Number of tickers requested per download call
             
         Returns:
-            DataFrame with mock OHLCV data
+            Dict mapping symbol to OHLCV DataFrame (symbols without data are omitted)
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=365 * 2)  # 2 years
+        fetched: Dict[str, pd.DataFrame] = {}
+        missing = []
+        
+        for symbol in symbols:
+            cached = self.cache.get(symbol, interval, start_date, end_date)
+            if cached is not None:
+                fetched[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        iterator = iter(missing)
+        while chunk := list(itertools.islice(iterator, chunk_size)):
+            try:
+                raw = yf.download(
+                    tickers=" ".join(to_ticker(symbol) for symbol in chunk),
+                    start=start_date,
+                    end=end_date,
+                    interval=interval,
+                    group_by="ticker",
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False
+                )
+            except Exception as e:
+                logger.error(f"Error bulk fetching {len(chunk)} symbols: {str(e)}")
+                continue
+            
+            if raw is None or raw.empty:
+                continue
+            
+            tickers = set(raw.columns.get_level_values(0))
+            for symbol in chunk:
+                ticker = to_ticker(symbol)
+                if ticker not in tickers:
+                    continue
+                
+                df = raw.xs(ticker, axis=1, level=0).dropna(how='all')
+                if df.empty:
+                    continue
+                
+                # Rename columns to standard format
+                df = df.rename(columns={
+                    'Open': 'open',
+                    'High': 'high',
+                    'Low': 'low',
+                    'Close': 'close',
+                    'Volume': 'volume'
+                })
+                df.columns.name = None
+                
+                df['symbol'] = symbol
+                df = df.reset_index()
+                df = compact_ohlcv(df.rename(columns={'Date': 'date'}))
+                fetched[symbol] = df
+                self.cache.set(symbol, interval, start_date, end_date, df)
+        
+        with self._stocks_data_lock:
+            self.stocks_data.update(fetched)
+        logger.info(f"Bulk fetched data for {len(fetched)}/{len(symbols)} symbols ({len(symbols) - len(missing)} from cache)")
+        return fetched
+    
+    @staticmethod
+    def _mock_dates(
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> pd.DatetimeIndex:
+        """
+        Get the monthly dates (first of each month) used for mock data.
+        Ensures the range includes the last 2 complete months (e.g., Nov 2025 and Dec 2025).
         """
-        # Ensure we have data for at least the last 2 complete months
         prev_month, last_month = get_last_two_complete_months()
         
         if start_date is None:
@@ -163,41 +425,101 @@ class CandlestickAnalyzer:
             # End at the last day of the last complete month
             end_date = last_month + relativedelta(months=1) - timedelta(days=1)
         
-        # Generate monthly dates (first of each month)
-        dates = pd.date_range(start=start_date, end=end_date, freq='MS')
+        return pd.date_range(start=start_date, end=end_date, freq='MS', unit='s')
+    
+    @staticmethod
+    def _mock_rng(symbol: str) -> np.random.Generator:
+        """
+        Get the mock data RNG for a symbol.
         
-        # Generate realistic-looking price data
-        np.random.seed(hash(symbol) % 2**32)
-        base_price = np.random.uniform(100, 3000)
+        Each symbol gets its own SeedSequence child keyed by a stable hash of
+        the symbol, so its series is the same in every process and batch.
+        """
+        return np.random.default_rng(
+            np.random.SeedSequence(MOCK_DATA_SEED, spawn_key=(zlib.crc32(symbol.encode()),))
+        )
+    
+    def bulk_mock(
+        self,
+        symbols: List[str],
+        dates: Optional[pd.DatetimeIndex] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Generate mock candlestick data for many symbols.
         
-        data = []
-        current_price = base_price
+        Each symbol's draws come from its own RNG stream (see _mock_rng); the
+        price math then runs once over (symbols x months) arrays. A symbol's
+        series is identical whether generated here or by _generate_mock_data.
         
-        for date in dates:
-            # Random price movement
-            change_pct = np.random.normal(0, 0.08)  # 8% std deviation
-            
-            open_price = current_price
-            close_price = current_price * (1 + change_pct)
-            high_price = max(open_price, close_price) * (1 + abs(np.random.normal(0, 0.02)))
-            low_price = min(open_price, close_price) * (1 - abs(np.random.normal(0, 0.02)))
-            volume = int(np.random.uniform(1000000, 50000000))
+        Args:
+            symbols: Stock symbols
+            dates: Monthly dates (defaults to the same range as _generate_mock_data)
             
-            data.append({
-                'date': date,
-                'open': round(open_price, 2),
-                'high': round(high_price, 2),
-                'low': round(low_price, 2),
-                'close': round(close_price, 2),
-                'volume': volume,
+        Returns:
+            Dict mapping symbol to mock OHLCV DataFrame
+        """
+        if dates is None:
+            dates = self._mock_dates()
+        
+        n = len(dates)
+        shape = (len(symbols), n)
+        base_prices = np.empty((len(symbols), 1))
+        changes = np.empty(shape)
+        wicks = np.empty(shape + (2,))
+        volumes = np.empty(shape, dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            rng = self._mock_rng(symbol)
+            base_prices[i] = rng.uniform(100, 3000)
+            changes[i] = rng.normal(0, 0.08, n)
+            wicks[i] = np.abs(rng.normal(0, 0.02, (n, 2)))
+            volumes[i] = rng.integers(1_000_000, 50_000_000, n)
+        
+        # Random price movement (8% std deviation); each month opens at the previous close
+        closes = base_prices * np.cumprod(1 + changes, axis=1)
+        opens = np.empty(shape)
+        opens[:, :1] = base_prices
+        opens[:, 1:] = closes[:, :-1]
+        highs = np.maximum(opens, closes) * (1 + wicks[..., 0])
+        lows = np.minimum(opens, closes) * (1 - wicks[..., 1])
+        
+        opens, highs, lows, closes = (a.round(2).astype(np.float32) for a in (opens, highs, lows, closes))
+        mock = {
+            symbol: pd.DataFrame({
+                'date': dates,
+                'open': opens[i],
+                'high': highs[i],
+                'low': lows[i],
+                'close': closes[i],
+                'volume': volumes[i],
                 'symbol': symbol
             })
-            
-            current_price = close_price
+            for i, symbol in enumerate(symbols)
+        }
         
-        df = pd.DataFrame(data)
-        self.stocks_data[symbol] = df
-        return df
+        with self._stocks_data_lock:
+            self.stocks_data.update(mock)
+        return mock
+    
+    def _generate_mock_data(
+        self, 
+        symbol: str, 
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Generate mock candlestick data for testing.
+        Ensures data includes the last 2 complete months (e.g., Nov 2025 and Dec 2025).
+        
+        Args:
+            symbol: Stock symbol
+            start_date: Start date
+            end_date: End date
+            
+        Returns:
+            DataFrame with mock OHLCV data
+        """
+        # Same generator as scans, so the detail page matches the scan results
+        return self.bulk_mock([symbol], self._mock_dates(start_date, end_date))[symbol]
     
     def process_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -209,31 +531,38 @@ class CandlestickAnalyzer:
         Returns:
             Processed DataFrame with additional fields
         """
-        df = data.copy()
-        
-        # Determine candle color (green = bullish, red = bearish)
-        df['is_green'] = df['close'] > df['open']
-        df['is_red'] = df['close'] < df['open']
-        df['candle_color'] = df.apply(
-            lambda x: 'green' if x['is_green'] else ('red' if x['is_red'] else 'neutral'),
-            axis=1
-        )
-        
-        # Calculate price change
-        df['price_change'] = df['close'] - df['open']
-        df['price_change_pct'] = ((df['close'] - df['open']) / df['open']) * 100
+        # Shallow copy: new columns are added without touching the caller's frame.
+        # Prices may be stored as float32 (see compact_ohlcv); all math and
+        # rounding downstream works on float64 copies
+        df = data.copy(deep=False)
+        df = df.astype({column: np.float64 for column in ('open', 'high', 'low', 'close')})
+        open_ = df['open'].to_numpy()
+        close = df['close'].to_numpy()
+        
+        # Candle direction: +1 green (bullish), -1 red (bearish), 0 neutral; see _SIGN_TO_COLOR
+        df['sign'] = (close > open_).astype(np.int8) - (close < open_).astype(np.int8)
+        
+        # Calculate price change (percentage is NaN where open is zero)
+        price_change = close - open_
+        df['price_change'] = price_change
+        df['price_change_pct'] = np.divide(
+            price_change, open_, out=np.full_like(price_change, np.nan), where=open_ != 0
+        ) * 100
         
         # Calculate body size
-        df['body_size'] = abs(df['close'] - df['open'])
+        df['body_size'] = np.abs(price_change)
+        
+        # Display dates, formatted once for signals and chart candles
+        df['date_str'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
         
         # Previous candle data
         df['prev_open'] = df['open'].shift(1)
         df['prev_close'] = df['close'].shift(1)
-        df['prev_color'] = df['candle_color'].shift(1)
+        df['prev_sign'] = df['sign'].shift(1, fill_value=0)
         
         return df
     
-    def generate_signals(self, data: pd.DataFrame) -> List[Dict]:
+    def generate_signals(self, data: pd.DataFrame, processed: Optional[pd.DataFrame] = None) -> List[Dict]:
         """
         Generate buy/sell signals based on candlestick patterns.
         
@@ -243,53 +572,53 @@ class CandlestickAnalyzer:
         
         Args:
             data: Processed DataFrame with candlestick data
+            processed: Output of process_data(data), if already computed
             
         Returns:
             List of signal dictionaries
         """
-        df = self.process_data(data)
+        df = processed if processed is not None else self.process_data(data)
         signals = []
         
-        for i in range(1, len(df)):
-            current = df.iloc[i]
-            previous = df.iloc[i - 1]
-            
-            signal = None
+        op = df['open'].to_numpy(dtype=np.float64)
+        cl = df['close'].to_numpy(dtype=np.float64)
+        signal_types, signal_idx = find_engulfing(op, cl, df['sign'].to_numpy())
+        
+        # Strength is the close's distance beyond the previous open, as a % of that open
+        signal_prev_op = op[signal_idx - 1]
+        strengths = np.round(np.abs(cl[signal_idx] - signal_prev_op) / signal_prev_op * 100, 2)
+        
+        # Only signal rows reach Python, in date order
+        date_strs = df['date_str'].to_numpy()
+        symbols = df['symbol']
+        for signal_type, i, strength in zip(signal_types.tolist(), signal_idx.tolist(), strengths.tolist()):
+            c_close = float(cl[i])
+            c_open = float(op[i])
+            p_open = float(op[i - 1])
+            p_close = float(cl[i - 1])
+            base = {
+                'symbol': symbols.iat[i],
+                'date': date_strs[i],
+                'current_close': round(c_close, 2),
+                'current_open': round(c_open, 2),
+                'prev_open': round(p_open, 2),
+                'prev_close': round(p_close, 2),
+            }
             
-            # Buy Signal: Current is green AND closes above previous red's open
-            if (current['is_green'] and 
-                previous['is_red'] and 
-                current['close'] > previous['open']):
-                signal = {
+            if signal_type == 1:
+                signals.append({
                     'type': 'BUY',
-                    'symbol': current['symbol'],
-                    'date': current['date'].strftime('%Y-%m-%d') if hasattr(current['date'], 'strftime') else str(current['date']),
-                    'current_close': round(current['close'], 2),
-                    'current_open': round(current['open'], 2),
-                    'prev_open': round(previous['open'], 2),
-                    'prev_close': round(previous['close'], 2),
-                    'strength': round(((current['close'] - previous['open']) / previous['open']) * 100, 2),
-                    'reason': f"Green candle closed at ₹{current['close']:.2f}, above previous red candle's open of ₹{previous['open']:.2f}"
-                }
-                
-            # Sell Signal: Current is red AND closes below previous green's open
-            elif (current['is_red'] and 
-                  previous['is_green'] and 
-                  current['close'] < previous['open']):
-                signal = {
+                    **base,
+                    'strength': strength,
+                    'reason': f"Green candle closed at ₹{c_close:.2f}, above previous red candle's open of ₹{p_open:.2f}"
+                })
+            else:
+                signals.append({
                     'type': 'SELL',
-                    'symbol': current['symbol'],
-                    'date': current['date'].strftime('%Y-%m-%d') if hasattr(current['date'], 'strftime') else str(current['date']),
-                    'current_close': round(current['close'], 2),
-                    'current_open': round(current['open'], 2),
-                    'prev_open': round(previous['open'], 2),
-                    'prev_close': round(previous['close'], 2),
-                    'strength': round(((previous['open'] - current['close']) / previous['open']) * 100, 2),
-                    'reason': f"Red candle closed at ₹{current['close']:.2f}, below previous green candle's open of ₹{previous['open']:.2f}"
-                }
-            
-            if signal:
-                signals.append(signal)
+                    **base,
+                    'strength': strength,
+                    'reason': f"Red candle closed at ₹{c_close:.2f}, below previous green candle's open of ₹{p_open:.2f}"
+                })
         
         return signals
     
@@ -308,7 +637,35 @@ class CandlestickAnalyzer:
             return signals[-1]
         return None
     
-    def generate_signal_for_last_two_months(self, data: pd.DataFrame) -> Optional[Dict]:
+    @staticmethod
+    def _to_soa(data: pd.DataFrame) -> OHLCV:
+        """
+        Convert an OHLCV DataFrame into NumPy arrays.
+        
+        Args:
+            data: DataFrame with candlestick data
+            
+        Returns:
+            OHLCV with one array per column
+        """
+        dates = pd.to_datetime(data['date'])
+        if dates.dt.tz is not None:
+            # Keep exchange-local wall time so month boundaries match the candles
+            dates = dates.dt.tz_localize(None)
+        
+        date = dates.to_numpy(dtype='datetime64[ns]')
+        return OHLCV(
+            date=date,
+            month_key=date.astype('datetime64[M]').astype('int64'),
+            open=data['open'].to_numpy(dtype=float),
+            high=data['high'].to_numpy(dtype=float),
+            low=data['low'].to_numpy(dtype=float),
+            close=data['close'].to_numpy(dtype=float),
+            volume=data['volume'].to_numpy(),
+            symbol=data['symbol'].iat[0] if 'symbol' in data.columns else 'UNKNOWN'
+        )
+    
+    def generate_signal_for_last_two_months(self, data: Union[OHLCV, pd.DataFrame]) -> Optional[Dict]:
         """
         Generate signal specifically by comparing the last 2 complete months.
         For example, compares Nov 2025 (previous) vs Dec 2025 (current).
@@ -318,106 +675,97 @@ class CandlestickAnalyzer:
         - Sell Signal: Nov is GREEN, Dec is RED, Dec close < Nov open
         
         Args:
-            data: DataFrame with candlestick data
+            data: Candlestick data as OHLCV arrays (DataFrames are converted)
             
         Returns:
             Signal dict if conditions met, None otherwise
         """
-        if data is None or len(data) < 2:
+        if isinstance(data, pd.DataFrame):
+            if len(data) < 2:
+                return None
+            data = self._to_soa(data)
+        if data is None or len(data.close) < 2:
             return None
         
         # Get the last 2 complete months
         prev_month_start, curr_month_start = get_last_two_complete_months()
         
-        df = self.process_data(data)
-        
-        # Convert date column to datetime if needed
-        if not pd.api.types.is_datetime64_any_dtype(df['date']):
-            df['date'] = pd.to_datetime(df['date'])
-        
-        # Filter for the specific months we want to compare
-        # Previous month (e.g., Nov 2025)
-        prev_month_data = df[
-            (df['date'].dt.year == prev_month_start.year) & 
-            (df['date'].dt.month == prev_month_start.month)
-        ]
-        
-        # Current month (e.g., Dec 2025)
-        curr_month_data = df[
-            (df['date'].dt.year == curr_month_start.year) & 
-            (df['date'].dt.month == curr_month_start.month)
-        ]
+        # Previous month (e.g., Nov 2025) and current month (e.g., Dec 2025)
+        prev_idx = first_row_in_month(data.month_key, prev_month_start)
+        curr_idx = first_row_in_month(data.month_key, curr_month_start)
         
         # If we don't have data for both months, fall back to last 2 available months
-        if prev_month_data.empty or curr_month_data.empty:
+        if prev_idx is None or curr_idx is None:
             logger.warning(f"Data not available for {get_month_name(prev_month_start)} or {get_month_name(curr_month_start)}, using last 2 available months")
-            if len(df) < 2:
-                return None
-            prev_month_data = df.iloc[[-2]]  # Second to last row
-            curr_month_data = df.iloc[[-1]]  # Last row
+            prev_idx, curr_idx = len(data.close) - 2, len(data.close) - 1
         
-        previous = prev_month_data.iloc[0]
-        current = curr_month_data.iloc[0]
+        prev_open = float(data.open[prev_idx])
+        prev_close = float(data.close[prev_idx])
+        curr_open = float(data.open[curr_idx])
+        curr_close = float(data.close[curr_idx])
+        curr_date = pd.Timestamp(data.date[curr_idx])
         
-        # Get symbol
-        symbol = current.get('symbol', data.iloc[0].get('symbol', 'UNKNOWN'))
+        symbol = data.symbol
         
         # Format month names for display
-        prev_month_name = get_month_name(pd.to_datetime(previous['date']))
-        curr_month_name = get_month_name(pd.to_datetime(current['date']))
+        prev_month_name = get_month_name(pd.Timestamp(data.date[prev_idx]))
+        curr_month_name = get_month_name(curr_date)
         
+        strength = float(np.round(np.abs(curr_close - prev_open) / prev_open * 100, 2))
         signal = None
         
         # Buy Signal: Previous month RED, Current month GREEN, Current close > Previous open
-        if (current['is_green'] and 
-            previous['is_red'] and 
-            current['close'] > previous['open']):
+        if (curr_close > curr_open and 
+            prev_close < prev_open and 
+            curr_close > prev_open):
             signal = {
                 'type': 'BUY',
                 'symbol': symbol,
-                'date': current['date'].strftime('%Y-%m-%d') if hasattr(current['date'], 'strftime') else str(current['date']),
+                'date': curr_date.strftime('%Y-%m-%d'),
                 'current_month': curr_month_name,
                 'previous_month': prev_month_name,
-                'current_close': round(float(current['close']), 2),
-                'current_open': round(float(current['open']), 2),
-                'prev_open': round(float(previous['open']), 2),
-                'prev_close': round(float(previous['close']), 2),
-                'strength': round(((float(current['close']) - float(previous['open'])) / float(previous['open'])) * 100, 2),
-                'reason': f"{curr_month_name} green candle closed at ₹{float(current['close']):.2f}, above {prev_month_name} red candle's open of ₹{float(previous['open']):.2f}"
+                'current_close': round(curr_close, 2),
+                'current_open': round(curr_open, 2),
+                'prev_open': round(prev_open, 2),
+                'prev_close': round(prev_close, 2),
+                'strength': strength,
+                'reason': f"{curr_month_name} green candle closed at ₹{curr_close:.2f}, above {prev_month_name} red candle's open of ₹{prev_open:.2f}"
             }
             
         # Sell Signal: Previous month GREEN, Current month RED, Current close < Previous open
-        elif (current['is_red'] and 
-              previous['is_green'] and 
-              current['close'] < previous['open']):
+        elif (curr_close < curr_open and 
+              prev_close > prev_open and 
+              curr_close < prev_open):
             signal = {
                 'type': 'SELL',
                 'symbol': symbol,
-                'date': current['date'].strftime('%Y-%m-%d') if hasattr(current['date'], 'strftime') else str(current['date']),
+                'date': curr_date.strftime('%Y-%m-%d'),
                 'current_month': curr_month_name,
                 'previous_month': prev_month_name,
-                'current_close': round(float(current['close']), 2),
-                'current_open': round(float(current['open']), 2),
-                'prev_open': round(float(previous['open']), 2),
-                'prev_close': round(float(previous['close']), 2),
-                'strength': round(((float(previous['open']) - float(current['close'])) / float(previous['open'])) * 100, 2),
-                'reason': f"{curr_month_name} red candle closed at ₹{float(current['close']):.2f}, below {prev_month_name} green candle's open of ₹{float(previous['open']):.2f}"
+                'current_close': round(curr_close, 2),
+                'current_open': round(curr_open, 2),
+                'prev_open': round(prev_open, 2),
+                'prev_close': round(prev_close, 2),
+                'strength': strength,
+                'reason': f"{curr_month_name} red candle closed at ₹{curr_close:.2f}, below {prev_month_name} green candle's open of ₹{prev_open:.2f}"
             }
         
         return signal
     
-    def analyze_stock(self, symbol: str) -> Dict:
+    def analyze_stock(self, symbol: str, data: Optional[pd.DataFrame] = None) -> Dict:
         """
         Complete analysis for a single stock.
         Compares the last 2 complete months (e.g., Nov 2025 vs Dec 2025).
         
         Args:
             symbol: Stock symbol
+            data: Pre-fetched OHLCV data (e.g., from fetch_bulk); fetched if None
             
         Returns:
             Analysis result dictionary
         """
-        data = self.fetch_candlestick_data(symbol)
+        if data is None:
+            data = self.fetch_candlestick_data(symbol)
         
         if data is None or data.empty:
             return {
@@ -428,14 +776,20 @@ class CandlestickAnalyzer:
         
         processed = self.process_data(data)
         
-        # Generate signal specifically for last 2 months (Nov vs Dec comparison)
-        latest_signal = self.generate_signal_for_last_two_months(data)
-        
-        # Also get all historical signals for reference
-        all_signals = self.generate_signals(data)
+        if len(processed) < 2:
+            # A single candle can't form a two-candle pattern; skip signal generation
+            latest_signal = None
+            all_signals = []
+        else:
+            # Generate signal specifically for last 2 months (Nov vs Dec comparison)
+            latest_signal = self.generate_signal_for_last_two_months(self._to_soa(data))
+            
+            # Also get all historical signals for reference
+            all_signals = self.generate_signals(data, processed)
         
         # Get current status (last complete month)
         current = processed.iloc[-1]
+        current_sign = int(current['sign'])
         
         # Get the months being compared for display
         prev_month, curr_month = get_last_two_complete_months()
@@ -443,9 +797,9 @@ class CandlestickAnalyzer:
         return {
             'symbol': symbol,
             'status': 'success',
-            'current_price': round(current['close'], 2),
-            'current_trend': 'bullish' if current['is_green'] else 'bearish',
-            'candle_color': current['candle_color'],
+            'current_price': round(float(current['close']), 2),
+            'current_trend': 'bullish' if current_sign == 1 else 'bearish',
+            'candle_color': str(_SIGN_TO_COLOR[current_sign + 1]),
             'price_change_pct': round(current['price_change_pct'], 2),
             'latest_signal': latest_signal,
             'comparison_months': f"{get_month_name(prev_month)} vs {get_month_name(curr_month)}",
@@ -453,12 +807,31 @@ class CandlestickAnalyzer:
             'last_updated': datetime.now().isoformat()
         }
     
-    def scan_all_stocks(self, stock_list: Optional[List[str]] = None) -> Dict:
+    def _analyze_stock_safe(self, symbol: str, data: Optional[pd.DataFrame] = None) -> Dict:
+        """Run analyze_stock, converting unexpected exceptions into an error result."""
+        try:
+            return self.analyze_stock(symbol, data)
+        except Exception as e:
+            logger.error(f"Error analyzing {symbol}: {str(e)}")
+            return {
+                'symbol': symbol,
+                'status': 'error',
+                'message': str(e)
+            }
+    
+    def scan_all_stocks(self, stock_list: Optional[List[str]] = None, threads: Optional[int] = None) -> Dict:
         """
         Scan all stocks and generate comprehensive report.
         
+        Data is prefetched in one batch (bulk_mock for mock data, fetch_bulk
+        for real data); symbols missing from the batch fall back to a
+        per-symbol fetch. Symbols are analyzed
+        concurrently on a thread pool and results are categorized on the
+        calling thread as they complete.
+        
         Args:
             stock_list: Optional list of stocks to scan (defaults to NSE_STOCKS)
+            threads: Maximum number of worker threads (defaults to min(32, number of stocks))
             
         Returns:
             Comprehensive scan results
@@ -475,9 +848,20 @@ class CandlestickAnalyzer:
             'errors': []
         }
         
-        for symbol in stocks:
-            try:
-                analysis = self.analyze_stock(symbol)
+        if threads is None:
+            threads = min(32, len(stocks))
+        
+        prefetched = self.bulk_mock(stocks) if self.use_mock_data else self.fetch_bulk(stocks)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(threads, len(stocks)))) as executor:
+            futures = {
+                executor.submit(self._analyze_stock_safe, symbol, prefetched.get(symbol)): symbol
+                for symbol in stocks
+            }
+            
+            for future in as_completed(futures):
+                symbol = futures[future]
+                analysis = future.result()
                 
                 if analysis['status'] == 'error':
                     results['errors'].append({
@@ -500,13 +884,6 @@ class CandlestickAnalyzer:
                         results['buy_signals'].append(analysis)
                     else:
                         results['sell_signals'].append(analysis)
-                        
-            except Exception as e:
-                logger.error(f"Error analyzing {symbol}: {str(e)}")
-                results['errors'].append({
-                    'symbol': symbol,
-                    'message': str(e)
-                })
         
         # Sort by signal strength
         results['buy_signals'].sort(
@@ -546,31 +923,31 @@ class CandlestickAnalyzer:
             return None
         
         processed = self.process_data(data)
-        signals = self.generate_signals(data)
+        signals = self.generate_signals(data, processed)
+        
+        # Build all candles column-wise and convert to records in one call
+        candles = pd.DataFrame({
+            'date': processed['date_str'],
+            'open': processed['open'].astype(np.float64).round(2),
+            'high': processed['high'].astype(np.float64).round(2),
+            'low': processed['low'].astype(np.float64).round(2),
+            'close': processed['close'].astype(np.float64).round(2),
+            'volume': processed['volume'].astype('int64'),
+            'color': _SIGN_TO_COLOR[processed['sign'].to_numpy() + 1]
+        })
         
         chart_data = {
             'symbol': symbol,
-            'candles': [],
+            'candles': candles.to_dict(orient='records'),
             'signals': signals
         }
         
-        for _, row in processed.iterrows():
-            chart_data['candles'].append({
-                'date': row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date']),
-                'open': round(row['open'], 2),
-                'high': round(row['high'], 2),
-                'low': round(row['low'], 2),
-                'close': round(row['close'], 2),
-                'volume': int(row['volume']),
-                'color': row['candle_color']
-            })
-        
         return chart_data
 
 
-def get_nse_stock_list() -> List[str]:
-    """Get the list of NSE stocks being tracked."""
-    return NSE_STOCKS.copy()
+def get_nse_stock_list() -> Tuple[str, ...]:
+    """Get the NSE stocks being tracked (an immutable tuple; copy with list() to modify)."""
+    return NSE_STOCKS
 
 
 # CLI interface for testing
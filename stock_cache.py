@@ -0,0 +1,171 @@
+"""
+Stock Cache Module
+Persistent on-disk cache for fetched candlestick data.
+
+Each entry is a pickled DataFrame plus a JSON sidecar recording when it was
+fetched. Entries expire after a TTL, except ranges that end before the current
+month: closed monthly candles never change, so those never expire. Ranges that
+run into the current month are keyed by month, so a month's refetches share
+one entry, and expired entries are pruned on write.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+class FileCache:
+    """
+    File-backed cache of OHLCV DataFrames keyed by symbol, interval and date range.
+    """
+    
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: timedelta = timedelta(hours=6)):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory: Directory holding cache files (created on first write)
+            ttl: Maximum age of entries whose range includes the current month
+        """
+        self.directory = directory
+        self.ttl = ttl
+    
+    @staticmethod
+    def _first_of_this_month() -> datetime:
+        """Start of the current (incomplete) month."""
+        return datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    def _paths(self, symbol: str, interval: str, start_date: datetime, end_date: datetime):
+        """Return the (pickle, sidecar) paths for a cache entry."""
+        first_of_this_month = self._first_of_this_month()
+        if end_date < first_of_this_month:
+            # Closed ranges are immutable; key them exactly
+            key = f"{symbol}|{interval}|{start_date:%Y-%m-%d}|{end_date:%Y-%m-%d}"
+        else:
+            # Open ranges (e.g. "2 years up to now") move daily; key them on the
+            # last complete month so every fetch this month shares one entry
+            key = f"{symbol}|{interval}|{start_date:%Y-%m}|open|{first_of_this_month:%Y-%m}"
+        digest = hashlib.md5(key.encode()).hexdigest()
+        base = os.path.join(self.directory, f"{symbol}_{interval}_{digest}")
+        return f"{base}.pkl", f"{base}.json"
+    
+    def _prune(self, symbol: str, interval: str) -> None:
+        """Remove a symbol's open-range entries that are older than the TTL."""
+        pattern = os.path.join(glob.escape(self.directory), f"{glob.escape(symbol)}_{glob.escape(interval)}_*.json")
+        for meta_path in glob.glob(pattern):
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                if meta.get('closed') or datetime.now() - datetime.fromisoformat(meta['fetched_at']) < self.ttl:
+                    continue
+            except FileNotFoundError:
+                continue
+            except Exception:
+                pass  # Unreadable sidecar: drop the entry
+            for path in (meta_path, meta_path[:-len('.json')] + '.pkl'):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+    
+    def get(
+        self,
+        symbol: str,
+        interval: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame if present and fresh.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            start_date: Start date of the fetched range
+            end_date: End date of the fetched range
+        
+        Returns:
+            Cached DataFrame, or None on a miss or expired entry
+        """
+        data_path, meta_path = self._paths(symbol, interval, start_date, end_date)
+        
+        try:
+            with open(meta_path) as f:
+                fetched_at = datetime.fromisoformat(json.load(f)['fetched_at'])
+            
+            range_closed = end_date < self._first_of_this_month()
+            if not range_closed and datetime.now() - fetched_at >= self.ttl:
+                return None
+            
+            return pd.read_pickle(data_path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry for {symbol}: {str(e)}")
+            return None
+    
+    def set(
+        self,
+        symbol: str,
+        interval: str,
+        start_date: datetime,
+        end_date: datetime,
+        df: pd.DataFrame
+    ) -> None:
+        """
+        Store a DataFrame in the cache, pruning the symbol's expired entries.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            start_date: Start date of the fetched range
+            end_date: End date of the fetched range
+            df: DataFrame to cache
+        """
+        data_path, meta_path = self._paths(symbol, interval, start_date, end_date)
+        
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._prune(symbol, interval)
+            # Write to temp files and rename so concurrent readers never see partial files;
+            # the sidecar goes last since readers treat it as the entry's presence marker
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            df.to_pickle(data_path + suffix)
+            os.replace(data_path + suffix, data_path)
+            with open(meta_path + suffix, 'w') as f:
+                json.dump({
+                    'fetched_at': datetime.now().isoformat(),
+                    'closed': end_date < self._first_of_this_month()
+                }, f)
+            os.replace(meta_path + suffix, meta_path)
+        except Exception as e:
+            logger.warning(f"Failed to cache data for {symbol}: {str(e)}")
+    
+    def invalidate(self, symbol: str) -> int:
+        """
+        Remove all cache entries for a symbol.
+        
+        Args:
+            symbol: Stock symbol
+        
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(symbol)}_*")):
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed